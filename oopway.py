@@ -1,27 +1,73 @@
+# нужен Python 3.10+: dataclass(slots=True) и field(kw_only=True)
 import json
+import sys
 from random import choice
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # без orjson работаем на стандартном json
+    orjson = None
 
 
 # classes
 class JSONCapability:
+    __slots__ = ()
+
     def to_json(self):
-        return {k: v if not isinstance(v, Vector) else str(v) for k, v in self.__dict__.items() if v is not None}
+        # поля с init=False - производные (SoA-списки BattleState), в JSON их не отдаём
+        res = {}
+        for f in fields(self):
+            if not f.init:
+                continue
+            v = getattr(self, f.name)
+            if v is not None:
+                res[f.name] = v if not isinstance(v, Vector) else str(v)
+        return res
+
+
+def fast_json(cls):
+    # генерирует to_json с именами полей прямо в коде вместо обхода fields() на каждый вызов
+    lines = ['def to_json(self):', '    d = {}']
+    for f in fields(cls):
+        if not f.init:
+            continue
+        lines.append(f'    v = self.{f.name}')
+        lines.append('    if v is not None:')
+        lines.append(f'        d[{f.name!r}] = str(v)' if f.type is Vector else f'        d[{f.name!r}] = v')
+    lines.append('    return d')
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    cls.to_json = namespace['to_json']
+    return cls
 
 
 # region primitives
-@dataclass
 class Vector:
-    X: int
-    Y: int
-    Z: int
+    # написан руками вместо @dataclass: __slots__ и простой __init__ заметно быстрее в горячих циклах
+    # векторы из from_json кэшируются и разделяются между объектами - не изменять их на месте
+    __slots__ = ('X', 'Y', 'Z')
+
+    def __init__(self, X: int, Y: int, Z: int):
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+
+    def __repr__(self):
+        return f"Vector(X={self.X!r}, Y={self.Y!r}, Z={self.Z!r})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.X == other.X and self.Y == other.Y and self.Z == other.Z
 
     @classmethod
     def from_json(cls, data):
-        x, y, z = map(int, data.split('/'))
-        return cls(x, y, z)
+        return _parse_vector(data)
 
     def clen(self):
         return abs(self)
@@ -36,12 +82,39 @@ class Vector:
         return Vector(self.X * -1, self.Y * -1, self.Z * -1)
 
     def __abs__(self):
-        return max([abs(self.X), abs(self.Y), abs(self.Z)])
+        # норма Чебышева без построения списка и вызова max()
+        ax = self.X
+        if ax < 0:
+            ax = -ax
+        ay = self.Y
+        if ay < 0:
+            ay = -ay
+        az = self.Z
+        if az < 0:
+            az = -az
+        if ay > ax:
+            ax = ay
+        if az > ax:
+            ax = az
+        return ax
 
     def __str__(self):
         return f"{self.X}/{self.Y}/{self.Z}"
 
 
+@lru_cache(maxsize=8192)
+def _parse_vector(data: str) -> Vector:
+    # координаты между ходами почти не меняются, так что одни и те же строки приходят снова и снова
+    x, y, z = data.split('/')
+    return Vector(int(x), int(y), int(z))
+
+
+# смещения восьми блоков корабля-куба относительно его Position
+_CUBE = ((0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0), (0, 1, 1), (1, 0, 1), (1, 1, 1))
+# блок, из которого стреляем, по октанту врага: индекс ((dx < 0) << 2) | ((dy < 0) << 1) | (dz >= 0)
+_GUN_OFFSETS = ((0, 0, 0), (0, 0, 1), (0, 1, 0), (0, 1, 1), (1, 0, 0), (1, 0, 1), (1, 1, 0), (1, 1, 1))
+
+
 # endregion
 
 # region equipment
@@ -62,7 +135,7 @@ class EffectType(Enum):
         self.Blaster = b_type
 
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentBlock(JSONCapability):
     Name: str
     Type: EquipmentType
@@ -70,59 +143,48 @@ class EquipmentBlock(JSONCapability):
     @classmethod
     def from_json(cls, data):
         try:
-            if EquipmentType(data['Type']) == EquipmentType.Energy:
-                return EnergyBlock(**data)
-            elif EquipmentType(data['Type']) == EquipmentType.Gun:
-                return GunBlock(**data)
-            elif EquipmentType(data['Type']) == EquipmentType.Engine:
-                return EngineBlock(**data)
-            elif EquipmentType(data['Type']) == EquipmentType.Health:
-                return HealthBlock(**data)
-            elif EquipmentType(data['Type']) == EquipmentType.Heal:
-                return HealBlock(**data)
-            elif EquipmentType(data['Type']) == EquipmentType.Shield:
-                return ShieldBlock(**data)
+            return _EQUIP_CLS[data['Type']](**data)
         except Exception:
             EngineBlock(Name='big_engine', MaxAccelerate=1, Type=EquipmentType.Engine)
 
 
-@dataclass
+@dataclass(slots=True)
 class EnergyBlock(EquipmentBlock):
     IncrementPerTurn: int
     MaxEnergy: int
     StartEnergy: int
-    Type = EquipmentType.Energy
+    Type: EquipmentType = field(default=EquipmentType.Energy, kw_only=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class EngineBlock(EquipmentBlock):
     MaxAccelerate: int
-    Type = EquipmentType.Engine
+    Type: EquipmentType = field(default=EquipmentType.Engine, kw_only=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class GunBlock(EquipmentBlock):
     Damage: int
     EffectType: EffectType
     EnergyPrice: int
     Radius: int
-    Type = EquipmentType.Gun
+    Type: EquipmentType = field(default=EquipmentType.Gun, kw_only=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthBlock(EquipmentBlock):
     MaxHealth: int
     StartHealth: int
 
 
-@dataclass
+@dataclass(slots=True)
 class EffectType(EquipmentBlock):
     MaxHealth: int
     StartHealth: int
-    Type = EquipmentType.Health
+    Type: EquipmentType = field(default=EquipmentType.Health, kw_only=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class HealBlock(EquipmentBlock):
     EnergyPrice: int
     Radius: int
@@ -130,47 +192,63 @@ class HealBlock(EquipmentBlock):
     EnergyGain: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ShieldBlock(EquipmentBlock):
     EnergyPrice: int
     Armor: int
 
 
+# класс блока по сырому значению Type, чтобы не создавать EquipmentType на каждый блок
+_EQUIP_CLS = {
+    EquipmentType.Energy.value: EnergyBlock,
+    EquipmentType.Gun.value: GunBlock,
+    EquipmentType.Engine.value: EngineBlock,
+    EquipmentType.Health.value: HealthBlock,
+    EquipmentType.Heal.value: HealBlock,
+    EquipmentType.Shield.value: ShieldBlock,
+}
+
+
 # endregion
 
 # region battle commands
 
-@dataclass
+@dataclass(slots=True)
 class CommandParameters(JSONCapability):
     pass
 
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class AttackCommandParameters(CommandParameters):
     Id: int
     Name: str
     Target: Vector
 
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class MoveCommandParameters(CommandParameters):
     Id: int
     Target: Vector
 
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class AccelerateCommandParameters(CommandParameters):
     Id: int
     Vector: Vector
 
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class UserCommand(JSONCapability):
     Command: str
     Parameters: CommandParameters
 
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class BattleOutput(JSONCapability):
     Message: str = None
     UserCommands: List[UserCommand] = None
@@ -179,7 +257,7 @@ class BattleOutput(JSONCapability):
 # endregion
 
 # region draft commands
-@dataclass
+@dataclass(slots=True)
 class MapRegion(JSONCapability):
     From: Vector
     To: Vector
@@ -191,7 +269,7 @@ class MapRegion(JSONCapability):
         return cls(v1, v2)
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftEquipment(JSONCapability):
     Size: int
     Equipment: List[EquipmentBlock]
@@ -203,7 +281,7 @@ class DraftEquipment(JSONCapability):
         return cls(size, equipment)
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftCompleteShip(JSONCapability):
     Id: str
     Price: int
@@ -217,13 +295,13 @@ class DraftCompleteShip(JSONCapability):
         return cls(Id, price, equipment)
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftShipChoice(JSONCapability):
     CompleteShipId: str
     Position: Vector = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftOptions(JSONCapability):
     PlayerId: int
     MapSize: int
@@ -251,7 +329,7 @@ class DraftOptions(JSONCapability):
         #            start_area, equipment, ships)
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftChoice(JSONCapability):
     Message: str = None
     Ships: List[DraftCompleteShip] = None
@@ -261,7 +339,7 @@ class DraftChoice(JSONCapability):
 
 # region battle state
 
-@dataclass
+@dataclass(slots=True)
 class Ship(JSONCapability):
     Id: int
     Position: Vector
@@ -279,17 +357,11 @@ class Ship(JSONCapability):
         return cls(**data)
 
     def get_all_points(self):
-        return [self.Position,
-                self.Position + Vector(1, 0, 0),
-                self.Position + Vector(0, 1, 0),
-                self.Position + Vector(0, 0, 1),
-                self.Position + Vector(1, 1, 0),
-                self.Position + Vector(0, 1, 1),
-                self.Position + Vector(1, 0, 1),
-                self.Position + Vector(1, 1, 1)]
+        x, y, z = self.Position.X, self.Position.Y, self.Position.Z
+        return [Vector(x + ox, y + oy, z + oz) for ox, oy, oz in _CUBE]
 
 
-@dataclass
+@dataclass(slots=True)
 class FireInfo(JSONCapability):
     EffectType: EffectType
     Source: Vector
@@ -306,11 +378,21 @@ class FireInfo(JSONCapability):
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class BattleState(JSONCapability):
     FireInfos: List[FireInfo]
     My: List[Ship]
     Opponent: List[Ship]
+    # координаты кораблей и здоровье врагов отдельными списками (SoA) для горячих циклов,
+    # считаются из My/Opponent в __post_init__
+    my_pos: List[Tuple[int, int, int]] = field(init=False, repr=False, compare=False)
+    opp_pos: List[Tuple[int, int, int]] = field(init=False, repr=False, compare=False)
+    opp_hp: List[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.my_pos = [(s.Position.X, s.Position.Y, s.Position.Z) for s in self.My]
+        self.opp_pos = [(s.Position.X, s.Position.Y, s.Position.Z) for s in self.Opponent]
+        self.opp_hp = [s.Health for s in self.Opponent]
 
     @classmethod
     def from_json(cls, data):
@@ -325,26 +407,18 @@ class BattleState(JSONCapability):
 
 # help methods
 def plotLine3d(x0: int, y0: int, z0: int, x1: int, y1: int, z1: int) -> List:
-    res = []
+    # 3D Брезенхем; длина ответа известна заранее, так что список выделяем сразу
     dx = abs(x1 - x0)
-    if x0 < x1:
-        sx = 1
-    else:
-        sx = -1
+    sx = 1 if x0 < x1 else -1
     dy = abs(y1 - y0)
-    if y0 < y1:
-        sy = 1
-    else:
-        sy = -1
+    sy = 1 if y0 < y1 else -1
     dz = abs(z1 - z0)
-    if z0 < z1:
-        sz = 1
-    else:
-        sz = -1
+    sz = 1 if z0 < z1 else -1
     dm = max(dx, dy, dz)
+    res = [None] * dm
     x1 = y1 = z1 = dm // 2
     for i in range(dm):
-        res.append((x0, y0, z0))
+        res[i] = (x0, y0, z0)
         # setPixel(x0,y0,z0);
         x1 -= dx
         if x1 < 0:
@@ -361,20 +435,49 @@ def plotLine3d(x0: int, y0: int, z0: int, x1: int, y1: int, z1: int) -> List:
     return res
 
 
-def adapt(team: int, vector: Vector):
-    if team == 1:
-        return Vector(draft_options.MapSize - 2 - vector.X,
-                      draft_options.MapSize - 2 - vector.Y,
-                      draft_options.MapSize - 2 - vector.Z)
+def _adapt_identity(team: int, vector: Vector):
     return vector
 
 
+def _make_adapt_mirror(map_size: int):
+    # MapSize - 2 считаем один раз за игру и держим в замыкании
+    m2 = map_size - 2
+
+    def _adapt_mirror(team: int, vector: Vector):
+        return Vector(m2 - vector.X, m2 - vector.Y, m2 - vector.Z)
+
+    return _adapt_mirror
+
+
+# отражает координаты для игрока 1; реализация выбирается в make_draft по PlayerId,
+# team оставлен в сигнатуре для совместимости вызовов
+adapt = _adapt_identity
+
+
 def speed_limiter(initial, limit):
-    if initial > limit:
-        return limit
-    if initial < limit * -1:
-        return limit * -1
-    return initial
+    return limit if initial > limit else -limit if initial < -limit else initial
+
+
+def _closest_points(my_pos, target_pos, limit):
+    # ближайшая по Чебышеву пара точек двух кораблей-кубов, перебор 8x8 на целых числах
+    # возвращает (расстояние, точка цели, наша точка); если ничего не ближе limit - первые точки
+    mx, my, mz = my_pos
+    tx, ty, tz = target_pos
+    dx, dy, dz = tx - mx, ty - my, tz - mz
+    best_dist = limit
+    best_my = best_target = _CUBE[0]
+    for a in _CUBE:
+        ax, ay, az = a
+        for b in _CUBE:
+            bx, by, bz = b
+            dist = max(abs(dx + bx - ax), abs(dy + by - ay), abs(dz + bz - az))
+            if dist < best_dist:
+                best_dist = dist
+                best_my = a
+                best_target = b
+    return (best_dist,
+            (tx + best_target[0], ty + best_target[1], tz + best_target[2]),
+            (mx + best_my[0], my + best_my[1], mz + best_my[2]))
 
 
 def make_simple_move(battle_state: BattleState, battle_output: BattleOutput, ship: Ship, point: Vector):
@@ -390,102 +493,110 @@ def choose_gun(ship):
     return guns[0]  # самое простое получение пушки
 
 
-def shoot_target_enemy(ship, enemy_target, battle_state, battle_output):
-    global debug_string
-    gun = choose_gun(ship)
+def attack_point(battle_output, ship, gun, point: Vector):
+    # стреляем в точку и в соседний по X блок
+    battle_output.UserCommands.append(UserCommand(Command="ATTACK",
+                                                  Parameters=AttackCommandParameters(ship.Id,
+                                                                                     gun.Name,
+                                                                                     point)))
+    battle_output.UserCommands.append(UserCommand(Command="ATTACK",
+                                                  Parameters=AttackCommandParameters(ship.Id,
+                                                                                     gun.Name,
+                                                                                     point + Vector(1, 0, 0))))
+
+
+def _gun_position(ship_pos, enemy_pos):
     # ищем блок, из которого будет вестись стрельба
-    gun_pos = ship.Position
+    # пространство вокруг корабля на 8 частей, каждая для своего блока(как геометрические четверти в 3D)
+    sx, sy, sz = ship_pos
+    ex, ey, ez = enemy_pos
+    ox, oy, oz = _GUN_OFFSETS[((ex < sx) << 2) | ((ey < sy) << 1) | (ez >= sz)]
+    return sx + ox, sy + oy, sz + oz
+
+
+def _closest_reachable_point(gun_pos, enemy_pos, reach):
+    # ближайшая к gun_pos точка врага, до которой можно дострелить, или None
+    # расстояние по Чебышеву считаем прямо на целых, без временных Vector и вызовов abs/max
+    gx, gy, gz = gun_pos
+    ex, ey, ez = enemy_pos
+    rx, ry, rz = ex - gx, ey - gy, ez - gz
     min_distance = 1000000  # ищем ближайшую точку врага
-    min_vector = None
-    for point in enemy_target.get_all_points():  # перебираем все точки
-        dist_to_point = abs(point - gun_pos)  # расстояние до точки по Чебышеву
-        if dist_to_point <= gun.Radius + 4 and dist_to_point < min_distance:
+    min_offset = None
+    for offset in _CUBE:  # перебираем все точки
+        ox, oy, oz = offset
+        d = rx + ox
+        if d < 0:
+            d = -d
+        t = ry + oy
+        if t < 0:
+            t = -t
+        if t > d:
+            d = t
+        t = rz + oz
+        if t < 0:
+            t = -t
+        if t > d:
+            d = t
+        if d <= reach and d < min_distance:
             # если можем дострелить и точка ближе всех остальных
-            min_distance = dist_to_point
-            min_vector = point
-    if min_distance < 1000000:  # если нашли точку, до которой можем дострелить, то добаляем
-        battle_output.UserCommands.append(UserCommand(Command="ATTACK",
-                                                      Parameters=AttackCommandParameters(ship.Id,
-                                                                                         gun.Name,
-                                                                                         min_vector)))
-        battle_output.UserCommands.append(UserCommand(Command="ATTACK",
-                                                      Parameters=AttackCommandParameters(ship.Id,
-                                                                                         gun.Name,
-                                                                                         min_vector + Vector(1, 0, 0))))
+            min_distance = d
+            min_offset = offset
+    if min_offset is None:
+        return None
+    return ex + min_offset[0], ey + min_offset[1], ez + min_offset[2]
+
+
+def _pick_targets(opp_pos, opp_hp, ship_pos, reach):
+    # для каждого врага ищем ближайшую точку, до которой можно дострелить из ship_pos
+    # возвращает [(хп цели, (x, y, z) точки)], считает только на целых числах
+    available = []
+    for enemy_pos, hp in zip(opp_pos, opp_hp):
+        point = _closest_reachable_point(_gun_position(ship_pos, enemy_pos), enemy_pos, reach)
+        if point is not None:  # если нашли точку, до которой можем дострелить, то добаляем
+            available.append((hp, point))
+    return available
+
+
+def shoot_target_enemy(ship, enemy_target, battle_state, battle_output):
+    gun = choose_gun(ship)
+    ship_pos = (ship.Position.X, ship.Position.Y, ship.Position.Z)
+    target_pos = (enemy_target.Position.X, enemy_target.Position.Y, enemy_target.Position.Z)
+    # по выбранной цели стреляем прямо из Position, с запасом в 4 клетки
+    point = _closest_reachable_point(ship_pos, target_pos, gun.Radius + 4)
+    if point is not None:
+        attack_point(battle_output, ship, gun, Vector(*point))
         return
     shoot_nearest_enemy(ship, battle_state, battle_output)
-    return
 
 
 def shoot_nearest_enemy(ship, battle_state: BattleState, battle_output):
-    global debug_string
     # вибирает самый слабый корабль до которого может дострелить
-    guns = [x for x in ship.Equipment if isinstance(x, GunBlock)]  # берем все блоки оружия
-    if not guns:  # нет оружия - не стреляем
+    gun = choose_gun(ship)
+    if gun is None:  # нет оружия - не стреляем
         return
-    gun = guns[0]  # самое простое получение пушки
-    available = []  # список доступных целей в формате [(хп цели, вектор стрельбы)]
-    for enemy in battle_state.Opponent:
-        # ищем блок, из которого будет вестись стрельба
-        ships_interposition = enemy.Position - ship.Position  # взаимоположение кораблей
-        # пространство вокруг корабля на 8 частей, каждая для своего блока(как геометрические четверти в 3D)
-        gun_pos = ship.Position
-        if ships_interposition.X >= 0 and ships_interposition.Y >= 0:
-            if ships_interposition.Z >= 0:
-                gun_pos = ship.Position + Vector(0, 0, 1)
-            else:
-                gun_pos = ship.Position
-        elif ships_interposition.X >= 0 and ships_interposition.Y < 0:
-            if ships_interposition.Z >= 0:
-                gun_pos = ship.Position + Vector(0, 1, 1)
-            else:
-                gun_pos = ship.Position + Vector(0, 1, 0)
-        elif ships_interposition.X < 0 and ships_interposition.Y >= 0:
-            if ships_interposition.Z >= 0:
-                gun_pos = ship.Position + Vector(1, 0, 1)
-            else:
-                gun_pos = ship.Position + Vector(1, 0, 0)
-        elif ships_interposition.X < 0 and ships_interposition.Y < 0:
-            if ships_interposition.Z >= 0:
-                gun_pos = ship.Position + Vector(1, 1, 1)
-            else:
-                gun_pos = ship.Position + Vector(1, 1, 0)
-        min_distance = 1000000  # ищем ближайшую точку врага
-        min_vector = None
-        for point in enemy.get_all_points():  # перебираем все точки
-            dist_to_point = abs(point - gun_pos)  # расстояние до точки по Чебышеву
-            if dist_to_point <= gun.Radius + 3 and dist_to_point < min_distance:
-                # если можем дострелить и точка ближе всех остальных
-                min_distance = dist_to_point
-                min_vector = point
-        if min_distance < 1000000:  # если нашли точку, до которой можем дострелить, то добаляем
-            available.append((enemy.Health, min_vector))
+    ship_pos = (ship.Position.X, ship.Position.Y, ship.Position.Z)
+    # список доступных целей в формате [(хп цели, вектор стрельбы)]
+    available = [(hp, Vector(*point))
+                 for hp, point in _pick_targets(battle_state.opp_pos, battle_state.opp_hp, ship_pos, gun.Radius + 3)]
     if not available:  # если никого не можем задеть не стреляем
         return
-    best_target = sorted(available, key=lambda x: x[0])[0][1]  # враг с самым низким здоровьем
-    debug_string += '   ' + str(ship.Id) + ':' + str(available)
-    battle_output.UserCommands.append(UserCommand(Command="ATTACK",
-                                                  Parameters=AttackCommandParameters(ship.Id,
-                                                                                     gun.Name,
-                                                                                     best_target)))
-    battle_output.UserCommands.append(UserCommand(Command="ATTACK",
-                                                  Parameters=AttackCommandParameters(ship.Id,
-                                                                                     gun.Name,
-                                                                                     best_target + Vector(1, 0, 0))))
+    best_target = min(available, key=itemgetter(0))[1]  # враг с самым низким здоровьем
+    debug_parts.append(f'   {ship.Id}:{available}')
+    attack_point(battle_output, ship, gun, best_target)
 
 
 draft_options: DraftOptions
-debug_string = ''
+debug_parts: List[str] = []  # отладка за ход, склеивается в Message в конце make_turn
 WasFirstTurn = False
-targets = {}
 taken = set()
 cnt = 0
 
 
 def make_draft(data: dict) -> DraftChoice:
     # принимаем данные
-    global draft_options
+    global draft_options, adapt
     draft_options = DraftOptions.from_json(data)
+    adapt = _make_adapt_mirror(draft_options.MapSize) if draft_options.PlayerId == 1 else _adapt_identity
     draft_choice = DraftChoice(Message=str(draft_options))
     # пихаем все корабли руками (место выбирается автоматически)
     draft_choice.Ships = []
@@ -499,7 +610,7 @@ def make_draft(data: dict) -> DraftChoice:
 
 
 def make_turn(data: dict) -> BattleOutput:
-    global debug_string, draft_options, targets, cnt
+    global draft_options, cnt
     # принимаем данные
     team = draft_options.PlayerId
     battle_state = BattleState.from_json(data)
@@ -533,23 +644,17 @@ def make_turn(data: dict) -> BattleOutput:
                 ))
         return battle_output
 
-    for ship in battle_state.My:
-        if targets.get(ship.Id, -1) not in [enemy.Id for enemy in battle_state.Opponent]:
-            # check_ships = lambda enemy: (enemy.Id in taken, abs(ship.Position - enemy.Position))
-            # targets[ship.Id] = min(battle_state.Opponent, key=check_ships)
-            targets[ship.Id] = min(battle_state.Opponent, key=lambda enemy: enemy.Health)
-        target = targets[ship.Id]
+    weakest = None  # самого слабого врага ищем не больше одного раза за ход
+    for ship, ship_pos in zip(battle_state.My, battle_state.my_pos):
+        # check_ships = lambda enemy: (enemy.Id in taken, abs(ship.Position - enemy.Position))
+        # targets[ship.Id] = min(battle_state.Opponent, key=check_ships)
+        if weakest is None:
+            weakest = min(battle_state.Opponent, key=attrgetter('Health'))
+        target = weakest
         taken.add(target.Id)
-        my_positions = ship.get_all_points()
-        target_positions = target.get_all_points()
-        closest_point = [draft_options.MapSize, target_positions[0], my_positions[0]]
-        for v1 in my_positions:
-            for v2 in target_positions:
-                dist = abs(v2 - v1)
-                if dist < closest_point[0]:
-                    closest_point[0] = dist
-                    closest_point[1] = v2
-                    closest_point[2] = v1
+        target_pos = (target.Position.X, target.Position.Y, target.Position.Z)
+        dist, target_point, my_point = _closest_points(ship_pos, target_pos, draft_options.MapSize)
+        closest_point = [dist, Vector(*target_point), Vector(*my_point)]
 
         # ищем пушку
         guns = [x for x in ship.Equipment if isinstance(x, GunBlock)]  # берем все блоки оружия
@@ -576,13 +681,11 @@ def make_turn(data: dict) -> BattleOutput:
             # затычка
             # make_simple_move(battle_state, battle_output, ship, closest_point[1])
             # затычка
+            max_accelerate = engine.MaxAccelerate
             escape_v = closest_point[2] - closest_point[1]
-            if abs(escape_v.X) > engine.MaxAccelerate:
-                escape_v.X = engine.MaxAccelerate * (1 if escape_v.X > 0 else -1)
-            if abs(escape_v.Y) > engine.MaxAccelerate:
-                escape_v.Y = engine.MaxAccelerate * (1 if escape_v.Y > 0 else -1)
-            if abs(escape_v.Z) > engine.MaxAccelerate:
-                escape_v.Z = engine.MaxAccelerate * (1 if escape_v.Z > 0 else -1)
+            escape_v = Vector(speed_limiter(escape_v.X, max_accelerate),
+                              speed_limiter(escape_v.Y, max_accelerate),
+                              speed_limiter(escape_v.Z, max_accelerate))
             test = ship.Position + escape_v
             if test.X <= draft_options.MapSize and test.Y <= draft_options.MapSize and test.Z <= draft_options.MapSize:
                 battle_output.UserCommands.append(UserCommand(
@@ -598,20 +701,39 @@ def make_turn(data: dict) -> BattleOutput:
             shoot_nearest_enemy(ship, battle_state, battle_output)
 
 
-    battle_output.Message = debug_string
-    debug_string = ''
+    battle_output.Message = ''.join(debug_parts)
+    debug_parts.clear()
     return battle_output
 
 
+def _to_json_default(obj):
+    if isinstance(obj, JSONCapability):
+        return obj.to_json()
+    if isinstance(obj, Vector):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(obj):
+    # один ответ - одна строка, сбрасываем вывод сразу, чтобы сервер не ждал
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(obj, default=_to_json_default,
+                                             option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_APPEND_NEWLINE))
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, default=_to_json_default, ensure_ascii=False), flush=True)
+
+
 def play_game():
     global draft_options, cnt
+    loads = orjson.loads if orjson is not None else json.loads
     while True:
         raw_line = input()
-        line = json.loads(raw_line)
+        line = loads(raw_line)
         if 'PlayerId' in line:
-            print(json.dumps(make_draft(line), default=lambda x: x.to_json(), ensure_ascii=False))
+            write_json(make_draft(line))
         elif 'My' in line:
-            print(json.dumps(make_turn(line), default=lambda x: x.to_json(), ensure_ascii=False))
+            write_json(make_turn(line))
             cnt += 1
 
 
@@ -0,0 +1,53 @@
+import itertools
+import unittest
+
+from oopway import Vector, _gun_position
+
+
+def gun_position_if_tree(ship_position: Vector, enemy_position: Vector) -> Vector:
+    # исходное дерево if/elif из shoot_nearest_enemy, эталон для таблицы _GUN_OFFSETS
+    ships_interposition = enemy_position - ship_position
+    gun_pos = ship_position
+    if ships_interposition.X >= 0 and ships_interposition.Y >= 0:
+        if ships_interposition.Z >= 0:
+            gun_pos = ship_position + Vector(0, 0, 1)
+        else:
+            gun_pos = ship_position
+    elif ships_interposition.X >= 0 and ships_interposition.Y < 0:
+        if ships_interposition.Z >= 0:
+            gun_pos = ship_position + Vector(0, 1, 1)
+        else:
+            gun_pos = ship_position + Vector(0, 1, 0)
+    elif ships_interposition.X < 0 and ships_interposition.Y >= 0:
+        if ships_interposition.Z >= 0:
+            gun_pos = ship_position + Vector(1, 0, 1)
+        else:
+            gun_pos = ship_position + Vector(1, 0, 0)
+    elif ships_interposition.X < 0 and ships_interposition.Y < 0:
+        if ships_interposition.Z >= 0:
+            gun_pos = ship_position + Vector(1, 1, 1)
+        else:
+            gun_pos = ship_position + Vector(1, 1, 0)
+    return gun_pos
+
+
+class GunPositionTest(unittest.TestCase):
+    def test_matches_if_tree_for_every_octant(self):
+        ship = Vector(10, 10, 10)
+        # -1/0/1 по каждой оси: все 8 комбинаций знаков и нулевые границы между ними
+        for dx, dy, dz in itertools.product((-5, -1, 0, 1, 5), repeat=3):
+            with self.subTest(delta=(dx, dy, dz)):
+                enemy = Vector(ship.X + dx, ship.Y + dy, ship.Z + dz)
+                expected = gun_position_if_tree(ship, enemy)
+                actual = _gun_position((ship.X, ship.Y, ship.Z), (enemy.X, enemy.Y, enemy.Z))
+                self.assertEqual(actual, (expected.X, expected.Y, expected.Z))
+
+    def test_z_bit_is_set_when_enemy_is_not_below(self):
+        # в отличие от X и Y, блок по Z сдвигается при dz >= 0
+        self.assertEqual(_gun_position((0, 0, 0), (0, 0, 0)), (0, 0, 1))
+        self.assertEqual(_gun_position((0, 0, 0), (0, 0, -1)), (0, 0, 0))
+        self.assertEqual(_gun_position((0, 0, 0), (-1, -1, -1)), (1, 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()